@@ -6,9 +6,121 @@ Actually works properly with proper color classification.
 
 import cv2
 import numpy as np
+import glob
+import hashlib
+import itertools
 import json
+import os
+from collections import Counter
 from typing import List, Tuple, Dict
 
+from cube_state import COLORS
+
+
+# Reference color order used by every classifier in this module; shared with
+# CubeState so detected color codes can be stored without translation
+COLOR_NAMES = COLORS
+WHITE, RED, GREEN, YELLOW, ORANGE, BLUE = range(len(COLOR_NAMES))
+
+# Where built HSV lookup tables are kept between runs. Bump LUT_VERSION
+# whenever the classification rules change so stale tables are ignored.
+LUT_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'cube_solver'
+)
+LUT_VERSION = 2
+
+
+def bgr_to_hsv(bgr_colors) -> np.ndarray:
+    """
+    Convert any array-like of BGR triplets to HSV with a single cvtColor call.
+    
+    Accepts a 3x3 face grid, a flat list of colors, etc. and returns a
+    uint8 array of the same shape.
+    """
+    bgr = np.asarray(bgr_colors, dtype=np.uint8)
+    hsv = cv2.cvtColor(bgr.reshape(1, -1, 3), cv2.COLOR_BGR2HSV)
+    return hsv.reshape(bgr.shape)
+
+
+def _hsv_distance(h1: int, s1: int, v1: int, h2: int, s2: int, v2: int) -> int:
+    """
+    Calculate HSV distance with special handling for red/orange.
+    
+    Weights are scaled by 10 so the distance stays an exact integer.
+    """
+    # Handle hue wraparound (0-179)
+    hue_diff = min(abs(h1 - h2), 180 - abs(h1 - h2))
+    sat_diff = abs(s1 - s2)
+    val_diff = abs(v1 - v2)
+    
+    # White detection: saturation is most important
+    if s1 < 50 or s2 < 50:
+        return hue_diff * 10 + sat_diff * 30 + val_diff * 5
+    
+    # Red/Orange separation: value becomes more important
+    if (h1 >= 160 or h1 <= 30) and (h2 >= 160 or h2 <= 30):
+        return hue_diff * 15 + sat_diff * 5 + val_diff * 10
+    
+    # Normal distance for other colors
+    return hue_diff * 20 + sat_diff * 8 + val_diff * 3
+
+
+def _classify_pixel(h: int, s: int, v: int, ref_hsv: np.ndarray) -> int:
+    """Classify one HSV pixel; returns an index into COLOR_NAMES."""
+    h, s, v = int(h), int(s), int(v)
+    
+    # Rule 1: White detection (very low saturation)
+    if s < 30 and v > 150:
+        return WHITE
+    
+    # Rule 2: Blue detection (high saturation + blue hue range)
+    if s > 150 and 100 <= h <= 130:
+        return BLUE
+    
+    # Rule 3: Green detection
+    if s > 100 and 55 <= h <= 85:
+        return GREEN
+    
+    # Rule 4: Yellow vs Orange vs Red separation (CRITICAL!)
+    if s > 150:  # High saturation colors
+        if 20 <= h <= 35:  # Yellow territory
+            return YELLOW
+        elif 5 <= h <= 19:  # Orange territory (narrow range)
+            return ORANGE
+        elif h >= 170:  # Red territory (high hue only)
+            return RED
+        elif h <= 4:  # Very low hue could be red or orange
+            # Use calibrated distance to decide
+            red_dist = _hsv_distance(h, s, v, int(ref_hsv[RED, 0]), int(ref_hsv[RED, 1]), int(ref_hsv[RED, 2]))
+            orange_dist = _hsv_distance(h, s, v, int(ref_hsv[ORANGE, 0]), int(ref_hsv[ORANGE, 1]), int(ref_hsv[ORANGE, 2]))
+            return RED if red_dist < orange_dist else ORANGE
+    
+    # Fallback to distance-based detection for edge cases
+    min_distance = 1 << 30
+    closest_color = WHITE
+    for i in range(ref_hsv.shape[0]):
+        distance = _hsv_distance(h, s, v, int(ref_hsv[i, 0]), int(ref_hsv[i, 1]), int(ref_hsv[i, 2]))
+        if distance < min_distance:
+            min_distance = distance
+            closest_color = i
+    
+    return closest_color
+
+
+def _compiled_fill_lut():
+    """
+    Numba LUT builder from lut_kernel, or None when Numba isn't installed.
+    
+    Numba is only imported here, on a lookup-table cache miss, so importing
+    this module doesn't pay for it when the table comes from disk.
+    """
+    try:
+        from lut_kernel import fill_lut
+    except ImportError:  # Numba is optional - the NumPy classifier is used instead
+        return None
+    return fill_lut
+
 
 class ColorDetector:
     """Actually working color detector."""
@@ -29,80 +141,164 @@ class ColorDetector:
             'D': 'yellow', 'L': 'orange', 'B': 'blue'
         }
         
+        # Expected center colors in Kociemba face order, for visualize_cube_2d
+        self._face_order = ['U', 'R', 'F', 'D', 'L', 'B']
+        self._expected_centers_arr = np.array([self.face_color_mapping[f] for f in self._face_order])
+        
+        # Per-face and 2D debug dumps are opt-in
+        self.verbose = False
+        
+        # Calibrated references as a (6, 3) array in COLOR_NAMES order
+        self._ref_names = np.array(COLOR_NAMES)
+        self._ref_hsv = np.array([self.calibrated_hsv[c] for c in COLOR_NAMES], dtype=np.int16)
+        
+        # Reused 1-pixel buffers for single-color conversions
+        self._px = np.empty((1, 1, 3), dtype=np.uint8)
+        self._px_hsv = np.empty((1, 1, 3), dtype=np.uint8)
+        
+        # Every 8-bit HSV value classified up front: detection is a table lookup
+        self._lut = self._load_lut()
+        
         print("✅ Using calibrated HSV values:")
         for color, hsv in self.calibrated_hsv.items():
             print(f"  {color:>8}: HSV{hsv}")
     
     def detect_color(self, bgr_color: Tuple[int, int, int]) -> str:
         """Enhanced detection with proper red/orange separation."""
-        hsv_color = self._bgr_to_hsv(bgr_color)
-        h, s, v = hsv_color
-        
-        # Rule 1: White detection (very low saturation)
-        if s < 30 and v > 150:
-            return 'white'
-        
-        # Rule 2: Blue detection (high saturation + blue hue range)
-        if s > 150 and 100 <= h <= 130:
-            return 'blue'
-        
-        # Rule 3: Green detection
-        if s > 100 and 55 <= h <= 85:
-            return 'green'
-        
-        # Rule 4: Yellow vs Orange vs Red separation (CRITICAL!)
-        if s > 150:  # High saturation colors
-            if 20 <= h <= 35:  # Yellow territory
-                return 'yellow'
-            elif 5 <= h <= 19:  # Orange territory (narrow range)
-                return 'orange'
-            elif h >= 170:  # Red territory (high hue only)
-                return 'red'
-            elif h <= 4:  # Very low hue could be red or orange
-                # Use calibrated distance to decide
-                red_dist = self._hsv_distance(hsv_color, self.calibrated_hsv['red'])
-                orange_dist = self._hsv_distance(hsv_color, self.calibrated_hsv['orange'])
-                return 'red' if red_dist < orange_dist else 'orange'
+        h, s, v = self._bgr_to_hsv(bgr_color)
+        return COLOR_NAMES[self._lut[h, s, v]]
     
-        # Fallback to distance-based detection for edge cases
-        min_distance = float('inf')
-        closest_color = 'white'
+    def _load_lut(self) -> np.ndarray:
+        """Load the lookup table from the disk cache, building it on a miss."""
+        key_data = json.dumps([LUT_VERSION, self.calibrated_hsv], sort_keys=True)
+        key = hashlib.sha1(key_data.encode()).hexdigest()[:12]
+        cache_path = os.path.join(LUT_CACHE_DIR, f"lut_{key}.npy")
+        
+        try:
+            lut = np.load(cache_path)
+            if lut.shape == (180, 256, 256) and lut.dtype == np.uint8:
+                return lut
+        except (OSError, ValueError, EOFError):
+            pass
+        
+        lut = self._build_lut()
+        
+        # Write to a temp file first so other processes never see a partial table
+        try:
+            os.makedirs(LUT_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, lut)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not cache color table: {e}")
+            return lut
+        
+        # Tables for older versions or calibrations won't be loaded again
+        for stale_path in glob.glob(os.path.join(LUT_CACHE_DIR, "lut_*.npy")):
+            if stale_path != cache_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+        
+        return lut
+    
+    def _build_lut(self) -> np.ndarray:
+        """
+        Precompute the color index of every OpenCV HSV value.
+        
+        Returns a (180, 256, 256) uint8 table indexed by [h, s, v]. OpenCV
+        HSV values are 8-bit integers, so the table covers every possible
+        input and gives exactly the same answers as the rule tree.
+        """
+        lut = np.empty((180, 256, 256), dtype=np.uint8)
+        fill_lut = _compiled_fill_lut()
+        if fill_lut is not None:
+            fill_lut(self._ref_hsv, lut)
+            return lut
+        
+        # NumPy fallback: classify one hue plane (256 x 256 S/V values) at a time
+        s, v = np.mgrid[0:256, 0:256]
+        hsv = np.empty((256 * 256, 3), dtype=np.uint8)
+        hsv[:, 1] = s.ravel()
+        hsv[:, 2] = v.ravel()
+        for h in range(180):
+            hsv[:, 0] = h
+            lut[h] = self._classify_hsv(hsv).reshape(256, 256)
+        return lut
+    
+    def _classify_hsv(self, hsv: np.ndarray) -> np.ndarray:
+        """
+        Classify an (N, 3) array of HSV pixels at once.
+        
+        Applies the same rules as _classify_pixel as boolean masks and
+        returns an array of indices into COLOR_NAMES.
+        """
+        h, s, v = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+        saturated = s > 150
+        
+        conditions = [
+            (s < 30) & (v > 150),                   # white
+            saturated & (h >= 100) & (h <= 130),    # blue
+            (s > 100) & (h >= 55) & (h <= 85),      # green
+            saturated & (h >= 20) & (h <= 35),      # yellow
+            saturated & (h >= 5) & (h <= 19),       # orange
+            saturated & (h >= 170),                 # red
+        ]
+        choices = [WHITE, BLUE, GREEN, YELLOW, ORANGE, RED]
+        indices = np.select(conditions, choices, default=-1)
+        
+        tie = saturated & (h <= 4)
+        unresolved = indices < 0
+        if not (tie.any() or unresolved.any()):
+            return indices
+        
+        # Very low hue could be red or orange - decide by calibrated distance
+        if tie.any():
+            d_red, d_orange = self._hsv_distances(hsv[tie], (RED, ORANGE)).T
+            indices[tie] = np.where(d_red < d_orange, RED, ORANGE)
         
-        for color_name, ref_hsv in self.calibrated_hsv.items():
-            distance = self._hsv_distance(hsv_color, ref_hsv)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_color = color_name
+        # Fallback to distance-based detection for edge cases
+        fallback = unresolved & ~tie
+        if fallback.any():
+            indices[fallback] = np.argmin(self._hsv_distances(hsv[fallback]), axis=1)
+        return indices
+    
+    def _hsv_distances(self, hsv: np.ndarray, colors=None) -> np.ndarray:
+        """
+        Vectorized _hsv_distance from (N, 3) HSV pixels to calibrated colors.
+        
+        Returns an (N, K) integer distance matrix, one column per index in
+        colors (all of COLOR_NAMES by default).
+        """
+        ref_hsv = self._ref_hsv if colors is None else self._ref_hsv[list(colors)]
+        pixels = hsv.astype(np.int32)[:, None, :]
+        refs = ref_hsv[None, :, :].astype(np.int32)
+        h1, s1 = pixels[..., 0], pixels[..., 1]
+        h2, s2 = refs[..., 0], refs[..., 1]
         
-        return closest_color
+        # Handle hue wraparound (0-179)
+        diff = np.abs(pixels - refs)
+        hue_diff = np.minimum(diff[..., 0], 180 - diff[..., 0])
+        sat_diff, val_diff = diff[..., 1], diff[..., 2]
+        
+        # Same weighting regimes as _hsv_distance, selected per pixel/reference pair
+        low_sat = (s1 < 50) | (s2 < 50)
+        warm = ((h1 >= 160) | (h1 <= 30)) & ((h2 >= 160) | (h2 <= 30))
+        hue_w = np.where(low_sat, 10, np.where(warm, 15, 20))
+        sat_w = np.where(low_sat, 30, np.where(warm, 5, 8))
+        val_w = np.where(low_sat, 5, np.where(warm, 10, 3))
+        
+        return hue_diff * hue_w + sat_diff * sat_w + val_diff * val_w
     
     def _bgr_to_hsv(self, bgr_color: Tuple[int, int, int]) -> Tuple[int, int, int]:
         """Convert BGR to HSV."""
-        bgr_array = np.uint8([[bgr_color]])
-        hsv_array = cv2.cvtColor(bgr_array, cv2.COLOR_BGR2HSV)
-        return tuple(int(x) for x in hsv_array[0][0])
-    
-    def _hsv_distance(self, hsv1: Tuple[int, int, int], hsv2: Tuple[int, int, int]) -> float:
-        """Calculate HSV distance with special handling for red/orange."""
-        h1, s1, v1 = hsv1
-        h2, s2, v2 = hsv2
-        
-        # Handle hue wraparound (0-179)
-        hue_diff = min(abs(h1 - h2), 180 - abs(h1 - h2))
-        sat_diff = abs(s1 - s2)
-        val_diff = abs(v1 - v2)
-        
-        # White detection: saturation is most important
-        if s1 < 50 or s2 < 50:
-            return hue_diff * 1.0 + sat_diff * 3.0 + val_diff * 0.5
-        
-        # Red/Orange separation: value becomes more important
-        if (h1 >= 160 or h1 <= 30) and (h2 >= 160 or h2 <= 30):
-            return hue_diff * 1.5 + sat_diff * 0.5 + val_diff * 1.0
-        
-        # Normal distance for other colors
-        return hue_diff * 2.0 + sat_diff * 0.8 + val_diff * 0.3
+        px = self._px
+        px[0, 0, 0], px[0, 0, 1], px[0, 0, 2] = bgr_color
+        cv2.cvtColor(px, cv2.COLOR_BGR2HSV, self._px_hsv)
+        h, s, v = self._px_hsv[0, 0].tolist()
+        return h, s, v
     
     def calibrate_from_centers(self, face_data: Dict) -> bool:
         """Calibration is hardcoded."""
@@ -111,39 +307,75 @@ class ColorDetector:
     
     def process_face_colors(self, face_bgr_colors: List[List[Tuple[int, int, int]]]) -> List[List[str]]:
         """Convert face colors using calibrated detection."""
-        result = []
-        for row in face_bgr_colors:
-            color_row = []
-            for bgr in row:
-                color = self.detect_color(bgr)
-                color_row.append(color)
-            result.append(color_row)
-        return result
+        return self.process_all_faces([face_bgr_colors])[0]
+    
+    def process_all_faces(self, faces_bgr_colors: List[List[List[Tuple[int, int, int]]]]) -> List[List[List[str]]]:
+        """Convert several faces (each a 3x3 grid of BGR colors) in one batch."""
+        return self._ref_names[self.process_face_codes(faces_bgr_colors)].tolist()
+    
+    def process_face_codes(self, faces_bgr_colors: List[List[List[Tuple[int, int, int]]]]) -> np.ndarray:
+        """
+        Classify several faces straight to color codes.
+        
+        Returns an (N, 3, 3) uint8 array of indices into COLOR_NAMES, which
+        CubeState.set_face stores as-is.
+        """
+        return self._classify_bgr(faces_bgr_colors).reshape(-1, 3, 3)
+    
+    def detect_colors_batch(self, bgr_colors) -> np.ndarray:
+        """
+        Classify any number of BGR colors at once.
+        
+        Accepts an array-like of BGR triples in any shape (..., 3) and returns
+        a flat array of color names, same answers as detect_color.
+        """
+        return self._ref_names[self._classify_bgr(bgr_colors)]
+    
+    def _classify_bgr(self, bgr_colors) -> np.ndarray:
+        """Flat array of color codes for an array-like of BGR triples."""
+        # One cvtColor call for every color, then one table gather
+        hsv = bgr_to_hsv(bgr_colors).reshape(-1, 3)
+        return self._lut[hsv[:, 0], hsv[:, 1], hsv[:, 2]]
     
     def print_face_debug(self, face_name: str, face_colors: List[List[str]]):
-        """Debug output."""
+        """Debug output (only when verbose)."""
+        if not self.verbose:
+            return
+        
         print(f"  {face_name} face:")
         for i, row in enumerate(face_colors):
             print(f"    Row {i+1}: {' '.join(f'{c:8}' for c in row)}")
         
         # Count colors
-        all_colors = [color for row in face_colors for color in row]
-        color_counts = {}
-        for color in all_colors:
-            color_counts[color] = color_counts.get(color, 0) + 1
+        color_counts = self._count_colors(face_colors)
         
         print(f"    Distribution: {color_counts}")
         print(f"    Center: {face_colors[1][1]}")
     
     def visualize_cube_2d(self, cube_state):
-        """Create a 2D representation of the scanned cube."""
-        print("\n" + "="*60)
-        print("🎲 2D CUBE VISUALIZATION - What Was Scanned")
-        print("="*60)
+        """
+        Create a 2D representation of the scanned cube.
         
+        The net is only printed when verbose; the center check always runs.
+        
+        Returns:
+            True if every center matches its expected color
+        """
         # Get face data from cube state
         faces = cube_state.faces
         
+        # Centers for validation, compared in one element-wise check
+        detected = np.array([faces[face][1][1] for face in self._face_order])
+        ok_mask = detected == self._expected_centers_arr
+        centers_valid = bool(ok_mask.all())
+        
+        if not self.verbose:
+            return centers_valid
+        
+        print("\n" + "="*60)
+        print("🎲 2D CUBE VISUALIZATION - What Was Scanned")
+        print("="*60)
+        
         # Color to emoji mapping for better visualization
         color_emojis = {
             'white': '⬜', 'red': '🟥', 'green': '🟩',
@@ -160,6 +392,10 @@ class ColorDetector:
             """Format a square with emoji if available."""
             return color_emojis.get(color, color_letters.get(color, '?'))
         
+        def format_row(row):
+            """Format one row of three squares."""
+            return " ".join(map(format_square, row))
+        
         # Standard cube net layout:
         #       [U]
         #   [L] [F] [R] [B]
@@ -168,11 +404,7 @@ class ColorDetector:
         print("\n    🔝 TOP (U - White)")
         print("    " + "-"*13)
         for row in faces['U']:
-            line = "    | "
-            for color in row:
-                line += format_square(color) + " "
-            line += "|"
-            print(line)
+            print("    | " + format_row(row) + " |")
         print("    " + "-"*13)
         
         print("\n🔄 MIDDLE ROW - Left to Right view")
@@ -181,77 +413,30 @@ class ColorDetector:
         print("+" + "-"*13 + "+" + "-"*13 + "+" + "-"*13 + "+" + "-"*13 + "+")
         
         for row_idx in range(3):
-            line = "| "
-            
-            # Left face (L)
-            for color in faces['L'][row_idx]:
-                line += format_square(color) + " "
-            line += "| "
-            
-            # Front face (F) 
-            for color in faces['F'][row_idx]:
-                line += format_square(color) + " "
-            line += "| "
-            
-            # Right face (R)
-            for color in faces['R'][row_idx]:
-                line += format_square(color) + " "
-            line += "| "
-            
-            # Back face (B)
-            for color in faces['B'][row_idx]:
-                line += format_square(color) + " "
-            line += "|"
-            
-            print(line)
+            # Left, Front, Right, Back
+            segments = (format_row(faces[face][row_idx]) for face in ('L', 'F', 'R', 'B'))
+            print("| " + " | ".join(segments) + " |")
         
         print("+" + "-"*13 + "+" + "-"*13 + "+" + "-"*13 + "+" + "-"*13 + "+")
         
         print("\n    🔻 BOTTOM (D - Yellow)")
         print("    " + "-"*13)
         for row in faces['D']:
-            line = "    | "
-            for color in row:
-                line += format_square(color) + " "
-            line += "|"
-            print(line)
+            print("    | " + format_row(row) + " |")
         print("    " + "-"*13)
         
         # Show centers for validation
         print("\n🎯 CENTER SQUARES ANALYSIS:")
-        centers = {
-            'U': faces['U'][1][1],  # Center of U face
-            'R': faces['R'][1][1],  # Center of R face
-            'F': faces['F'][1][1],  # Center of F face  
-            'D': faces['D'][1][1],  # Center of D face
-            'L': faces['L'][1][1],  # Center of L face
-            'B': faces['B'][1][1]   # Center of B face
-        }
-        
-        expected_centers = {
-            'U': 'white', 'R': 'red', 'F': 'green',
-            'D': 'yellow', 'L': 'orange', 'B': 'blue'
-        }
-        
-        for face, detected_color in centers.items():
-            expected_color = expected_centers[face]
+        center_rows = zip(self._face_order, detected.tolist(),
+                          self._expected_centers_arr.tolist(), ok_mask.tolist())
+        for face, detected_color, expected_color, ok in center_rows:
             emoji = format_square(detected_color)
-            if detected_color == expected_color:
-                status = "✅"
-            else:
-                status = "❌"
+            status = "✅" if ok else "❌"
             print(f"  Face {face}: {emoji} {detected_color:>8} {status} (should be {expected_color})")
         
         # Color distribution summary
         print("\n📊 COLOR DISTRIBUTION:")
-        all_colors = []
-        for face_data in faces.values():
-            for row in face_data:
-                all_colors.extend(row)
-        
-        color_counts = {}
-        for color in all_colors:
-            color_counts[color] = color_counts.get(color, 0) + 1
+        color_counts = self._count_colors(itertools.chain.from_iterable(faces.values()))
         
         for color, count in color_counts.items():
             emoji = format_square(color)
@@ -260,4 +445,9 @@ class ColorDetector:
         
         print("="*60)
         
-        return centers == expected_centers
+        return centers_valid
+    
+    @staticmethod
+    def _count_colors(rows) -> Dict[str, int]:
+        """Count color names in rows of a grid, in order of first appearance."""
+        return dict(Counter(itertools.chain.from_iterable(rows)))
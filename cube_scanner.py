@@ -69,6 +69,17 @@ class CubeScanner:
         
         self.current_face_index = 0
         self.scanned_faces = {}
+        
+        # Black instruction-panel overlay, allocated once per frame size
+        self._overlay = None
+        
+        # Mirrored preview frame, allocated once per frame size
+        self._mirrored = None
+        
+        # Grid geometry, computed once per frame size (see _build_grid)
+        self._grid_frame_size = None
+        self._grid_info = None
+        self._grid_segments = None
     
     def initialize_camera(self) -> bool:
         """Initialize the camera."""
@@ -83,6 +94,12 @@ class CubeScanner:
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
             
+            # Precompute the grid for the resolution the camera actually uses
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if width > 0 and height > 0:
+                self._build_grid(height, width)
+            
             print("✅ Camera initialized successfully")
             return True
             
@@ -97,10 +114,8 @@ class CubeScanner:
             cv2.destroyAllWindows()
             print("📹 Camera released.")
     
-    def draw_grid(self, frame: np.ndarray) -> np.ndarray:
-        """Draw a 3x3 grid overlay on the frame."""
-        h, w = frame.shape[:2]
-        
+    def _build_grid(self, h: int, w: int):
+        """Precompute grid position and line segments for an h x w frame."""
         # Calculate grid dimensions (centered square)
         size = min(h, w) - 100  # Leave margin
         start_x = (w - size) // 2
@@ -108,37 +123,49 @@ class CubeScanner:
         
         cell_size = size // 3
         
-        # Draw grid lines
-        color = (0, 255, 0)  # Green
-        thickness = 2
-        
-        # Vertical lines
+        segments = []
         for i in range(4):
+            # Vertical line
             x = start_x + i * cell_size
-            cv2.line(frame, (x, start_y), (x, start_y + size), color, thickness)
-        
-        # Horizontal lines  
-        for i in range(4):
+            segments.append([(x, start_y), (x, start_y + size)])
+            
+            # Horizontal line
             y = start_y + i * cell_size
-            cv2.line(frame, (start_x, y), (start_x + size, y), color, thickness)
+            segments.append([(start_x, y), (start_x + size, y)])
         
-        return frame, (start_x, start_y, cell_size)
+        self._grid_frame_size = (h, w)
+        self._grid_info = (start_x, start_y, cell_size)
+        self._grid_segments = np.array(segments, dtype=np.int32)
     
-    def draw_instructions(self, frame: np.ndarray, face_info: dict) -> np.ndarray:
-        """Draw scanning instructions on the frame."""
-        h, w = frame.shape[:2]
+    def _mirror(self, frame: np.ndarray) -> np.ndarray:
+        """Mirror the frame horizontally into a reused buffer."""
+        if self._mirrored is None or self._mirrored.shape != frame.shape:
+            self._mirrored = np.empty_like(frame)
+        return cv2.flip(frame, 1, dst=self._mirrored)
+    
+    def draw_grid(self, frame: np.ndarray) -> np.ndarray:
+        """Draw a 3x3 grid overlay on the frame."""
+        if frame.shape[:2] != self._grid_frame_size:
+            self._build_grid(*frame.shape[:2])
         
-        # Semi-transparent overlay for text background
-        overlay = frame.copy()
+        # Draw all grid lines in one call (green, thickness 2)
+        cv2.polylines(frame, self._grid_segments, False, (0, 255, 0), 2)
         
-        # Top instruction panel
-        cv2.rectangle(overlay, (0, 0), (w, 120), (0, 0, 0), -1)
+        return frame, self._grid_info
+    
+    def draw_instructions(self, frame: np.ndarray, face_info: dict) -> np.ndarray:
+        """Draw scanning instructions on the frame (in place)."""
+        h, w = frame.shape[:2]
         
-        # Bottom tips panel
-        cv2.rectangle(overlay, (0, h-80), (w, h), (0, 0, 0), -1)
+        # Semi-transparent overlay for text background (reused across frames)
+        if self._overlay is None or self._overlay.shape != frame.shape:
+            self._overlay = np.zeros_like(frame)
         
-        # Blend overlay
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+        # Blend only the top instruction and bottom tips panels, in place;
+        # the rest of the frame would blend with itself and stay unchanged.
+        # (Rows 0-120 inclusive, matching the filled cv2.rectangle it replaces)
+        for panel in (slice(0, 121), slice(h - 80, h)):
+            cv2.addWeighted(frame[panel], 0.7, self._overlay[panel], 0.3, 0, dst=frame[panel])
         
         # Current face info
         face_title = f"Face {self.current_face_index + 1}/6: {face_info['name']} ({face_info['color']} - {face_info['position']})"
@@ -164,34 +191,22 @@ class CubeScanner:
     def extract_colors(self, frame: np.ndarray, grid_info: tuple) -> List[List[Tuple[int, int, int]]]:
         """Extract colors from the 3x3 grid."""
         start_x, start_y, cell_size = grid_info
-        colors = []
         
-        for row in range(3):
-            color_row = []
-            for col in range(3):
-                # Calculate center of each cell
-                center_x = start_x + col * cell_size + cell_size // 2
-                center_y = start_y + row * cell_size + cell_size // 2
-                
-                # Sample a small area around the center
-                sample_size = 20
-                x1 = max(0, center_x - sample_size)
-                x2 = min(frame.shape[1], center_x + sample_size)
-                y1 = max(0, center_y - sample_size)
-                y2 = min(frame.shape[0], center_y + sample_size)
-                
-                # Extract color sample
-                sample = frame[y1:y2, x1:x2]
-                if sample.size > 0:
-                    # Get average color (BGR format)
-                    avg_color = tuple(map(int, np.mean(sample.reshape(-1, 3), axis=0)))
-                    color_row.append(avg_color)
-                else:
-                    color_row.append((0, 0, 0))
-            
-            colors.append(color_row)
+        # View the grid as (row, y, col, x, BGR) so all 9 cells reduce in one call
+        size = 3 * cell_size
+        roi = frame[start_y:start_y + size, start_x:start_x + size]
+        cells = roi.reshape(3, cell_size, 3, cell_size, 3)
         
-        return colors
+        # Sample a small area around the center of each cell
+        center = cell_size // 2
+        sample_size = min(20, center)
+        samples = cells[:, center - sample_size:center + sample_size,
+                        :, center - sample_size:center + sample_size]
+        
+        # Get average color (BGR format)
+        means = samples.mean(axis=(1, 3)).astype(int)
+        
+        return [[tuple(color) for color in row] for row in means.tolist()]
     
     def scan_face(self, face_info: dict) -> Optional[List[List[Tuple[int, int, int]]]]:
         """Scan a single face with guided instructions."""
@@ -203,29 +218,41 @@ class CubeScanner:
             if not self.initialize_camera():
                 return None
         
+        last_thumb = None
         while True:
             ret, frame = self.cap.read()
             if not ret:
                 print("❌ Failed to read from camera")
                 return None
             
-            # Mirror the image for better user experience
-            frame = cv2.flip(frame, 1)
-            
-            # Draw grid overlay
-            frame_with_grid, grid_info = self.draw_grid(frame)
-            
-            # Draw instructions
-            frame_with_instructions = self.draw_instructions(frame_with_grid, face_info)
-            
-            # Show the frame
-            cv2.imshow('Rubik\'s Cube Scanner - Follow Instructions', frame_with_instructions)
+            # Only redraw when the camera image changed by more than sensor
+            # noise (mean absolute difference of a coarse subsample)
+            thumb = frame[::64, ::64].astype(np.int16)
+            if last_thumb is None or np.abs(thumb - last_thumb).mean() >= 2:
+                last_thumb = thumb
+                
+                # Mirror the image for better user experience
+                frame = self._mirror(frame)
+                
+                # Draw grid overlay
+                frame_with_grid, grid_info = self.draw_grid(frame)
+                
+                # Sample now - the instruction panels are drawn onto this frame
+                colors = self.extract_colors(frame, grid_info)
+                
+                # Draw instructions
+                frame_with_instructions = self.draw_instructions(frame_with_grid, face_info)
+                
+                # Show the frame
+                cv2.imshow('Rubik\'s Cube Scanner - Follow Instructions', frame_with_instructions)
             
-            key = cv2.waitKey(1) & 0xFF
+            # Poll without blocking; idle briefly instead of spinning (~15 fps)
+            key = cv2.pollKey() & 0xFF
+            if key == 0xFF:
+                time.sleep(0.03)
+                continue
             
             if key == ord(' '):  # Space to capture
-                # Extract colors
-                colors = self.extract_colors(frame, grid_info)
                 print(f"✅ {face_info['name']} face captured!")
                 
                 # Show preview of captured colors
@@ -310,7 +337,7 @@ class CubeScanner:
             while True:
                 ret, frame = self.cap.read()
                 if ret:
-                    frame = cv2.flip(frame, 1)
+                    frame = self._mirror(frame)
                     cv2.putText(frame, "GET READY - Press any key to start", 
                               (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
                     cv2.putText(frame, "Position: WHITE on top, GREEN facing you", 
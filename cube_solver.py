@@ -6,78 +6,151 @@ Uses the Kociemba algorithm to find optimal solutions for Rubik's cube.
 Integrates with cube state representation and provides move explanations.
 """
 
-import kociemba
+import bisect
+import functools
+import logging
+import multiprocessing
+import os
+import re
+import sys
+from collections import Counter
 from typing import List, Optional, Tuple
-from cube_state import CubeState
+from cube_state import CubeState, FACE_FRAMES, facelet_permutation
+
+logger = logging.getLogger(__name__)
+
+# Facelet string of a solved cube, interned once at import
+_SOLVED_STATE = sys.intern("UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB")
+
+# Well-formed facelet string: 54 face letters (per-letter counts checked separately)
+_CUBE_STRING_RE = re.compile(r'[URFDLB]{54}')
+
+# Efficiency rating by move count: up to 15 moves is Excellent, up to 20 Good, ...
+_EFF_BOUNDS = (15, 20, 25)
+_EFF_LABELS = ('Excellent', 'Good', 'Fair', 'Could be better')
+
+
+def _rotation_tables(matrix) -> Tuple[List[int], dict, dict]:
+    """
+    Tables for looking at the cube after a whole-cube rotation.
+    
+    Returns:
+        (source facelet of each rotated facelet, str.translate table that
+        renames the face letters, rotated face -> original face for moves)
+    """
+    def rotate(v):
+        return tuple(sum(m * x for m, x in zip(row, v)) for row in matrix)
+    
+    face_by_normal = {frame[0]: face for face, frame in FACE_FRAMES.items()}
+    rotated_face = {face: face_by_normal[rotate(frame[0])] for face, frame in FACE_FRAMES.items()}
+    return (facelet_permutation(matrix).tolist(),
+            str.maketrans(rotated_face),
+            {new: old for old, new in rotated_face.items()})
+
+
+# Whole-cube rotations that put the F-B axis (x) and the R-L axis (z) on U-D,
+# so the two-phase search can also run along the other two axes
+_AXIS_ROTATIONS = tuple(_rotation_tables(matrix) for matrix in (
+    ((1, 0, 0), (0, 0, -1), (0, 1, 0)),
+    ((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+))
+
+
+def _solve_rotated(cube_string: str, rotation) -> str:
+    """Solve the cube seen after a whole-cube rotation, in original face names."""
+    source, relabel, original_face = rotation
+    rotated = ''.join([cube_string[i] for i in source]).translate(relabel)
+    return ' '.join(original_face[move[0]] + move[1:] for move in _cached_solve(rotated).split())
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_solve(cube_string: str) -> str:
+    """Run the two-phase search once per distinct facelet string."""
+    # Imported on first solve so loading this module never pulls in the solver
+    import kociemba
+    return kociemba.solve(cube_string)
 
 
 class CubeSolver:
     """Solves Rubik's cube using the Kociemba algorithm."""
     
-    def __init__(self):
-        """Initialize the cube solver."""
-        self.move_explanations = {
-            'R': "Right face clockwise",
-            "R'": "Right face counterclockwise", 
-            'R2': "Right face 180°",
-            'L': "Left face clockwise",
-            "L'": "Left face counterclockwise",
-            'L2': "Left face 180°", 
-            'U': "Up face clockwise",
-            "U'": "Up face counterclockwise",
-            'U2': "Up face 180°",
-            'D': "Down face clockwise", 
-            "D'": "Down face counterclockwise",
-            'D2': "Down face 180°",
-            'F': "Front face clockwise",
-            "F'": "Front face counterclockwise", 
-            'F2': "Front face 180°",
-            'B': "Back face clockwise",
-            "B'": "Back face counterclockwise",
-            'B2': "Back face 180°",
-            'M': "Middle slice (like L)",
-            "M'": "Middle slice (like L')",
-            'M2': "Middle slice 180°",
-            'E': "Equatorial slice (like D)",
-            "E'": "Equatorial slice (like D')",
-            'E2': "Equatorial slice 180°",
-            'S': "Standing slice (like F)",
-            "S'": "Standing slice (like F')", 
-            'S2': "Standing slice 180°"
-        }
+    # Plain-English description of each move, shared by all instances
+    MOVE_EXPLANATIONS = {
+        'R': "Right face clockwise",
+        "R'": "Right face counterclockwise", 
+        'R2': "Right face 180°",
+        'L': "Left face clockwise",
+        "L'": "Left face counterclockwise",
+        'L2': "Left face 180°", 
+        'U': "Up face clockwise",
+        "U'": "Up face counterclockwise",
+        'U2': "Up face 180°",
+        'D': "Down face clockwise", 
+        "D'": "Down face counterclockwise",
+        'D2': "Down face 180°",
+        'F': "Front face clockwise",
+        "F'": "Front face counterclockwise", 
+        'F2': "Front face 180°",
+        'B': "Back face clockwise",
+        "B'": "Back face counterclockwise",
+        'B2': "Back face 180°",
+        'M': "Middle slice (like L)",
+        "M'": "Middle slice (like L')",
+        'M2': "Middle slice 180°",
+        'E': "Equatorial slice (like D)",
+        "E'": "Equatorial slice (like D')",
+        'E2': "Equatorial slice 180°",
+        'S': "Standing slice (like F)",
+        "S'": "Standing slice (like F')", 
+        'S2': "Standing slice 180°"
+    }
     
-    def solve_cube(self, cube_state: CubeState) -> Optional[List[str]]:
+    def warm_up(self) -> None:
+        """
+        Load kociemba and its pruning tables ahead of the first real solve.
+        
+        Can run in a background thread, but it must finish (join the thread)
+        before anything else calls into kociemba: its table initialization
+        is not re-entrant.
+        """
+        import kociemba
+        kociemba.solve(_SOLVED_STATE)
+    
+    def solve_cube(self, cube_state: CubeState, cube_string: Optional[str] = None) -> Optional[List[str]]:
         """
         Solve the cube and return the solution as a list of moves.
         
         Args:
             cube_state: The current state of the cube
+            cube_string: Already-encoded Kociemba string for cube_state, if the
+                caller has one (skips encoding it again)
             
         Returns:
             List of move strings, or None if no solution found
         """
         # Convert cube state to Kociemba format
-        cube_string = self._cube_state_to_string(cube_state)
+        if cube_string is None:
+            cube_string = self._cube_state_to_string(cube_state)
         
         if not cube_string:
-            print("❌ Failed to convert cube state to string format")
+            logger.error("❌ Failed to convert cube state to string format")
             return None
         
-        print(f"🔤 Cube state: {cube_string}")
+        logger.debug("🔤 Cube state: %s", cube_string)
         
         # Check if cube is already solved
         if self._is_solved(cube_string):
-            print("🎉 Cube is already solved! No moves needed.")
+            logger.info("🎉 Cube is already solved! No moves needed.")
             return []
         
-        print(f"🧠 Solving cube state: {cube_string}")
+        logger.info("🧠 Solving cube state: %s", cube_string)
         
         try:
             # Use Kociemba algorithm to solve
-            solution = kociemba.solve(cube_string)
+            solution = _cached_solve(cube_string)
             
             if solution == "":
-                print("🎉 Cube is already solved!")
+                logger.info("🎉 Cube is already solved!")
                 return []
             
             # Split solution into individual moves
@@ -85,41 +158,90 @@ class CubeSolver:
             return moves
             
         except Exception as e:
-            print(f"❌ Solver error: {e}")
+            logger.error("❌ Solver error: %s", e)
+            return None
+    
+    def solve(self, cube_string: str, use_symmetry: bool = False) -> Optional[str]:
+        """
+        Solve a Kociemba facelet string.
+        
+        Args:
+            cube_string: 54-letter facelet string (see validate_cube_string)
+            use_symmetry: Also search along the F-B and R-L axes (the cube
+                rotated so that axis is U-D) and keep the shortest solution
+            
+        Returns:
+            Solution in Kociemba notation ("" if already solved), or None on error
+        """
+        if self._is_solved(cube_string):
+            return ""
+        
+        try:
+            solutions = [_cached_solve(cube_string)]
+            if use_symmetry:
+                solutions.extend(_solve_rotated(cube_string, rotation) for rotation in _AXIS_ROTATIONS)
+        except Exception as e:
+            logger.error("❌ Solver error: %s", e)
             return None
+        
+        return min(solutions, key=self.get_move_count)
+    
+    def solve_many(self, cube_strings: List[str], workers: Optional[int] = None,
+                   use_symmetry: bool = False) -> List[Optional[str]]:
+        """
+        Solve several facelet strings in parallel worker processes.
+        
+        Each worker loads the solver tables once, then takes scrambles in
+        chunks. A single scramble (or workers=1) is solved in this process.
+        Workers are spawned, not forked: a fork after Numba has started its
+        threading layer (e.g. a LUT build in ColorDetector) hangs at exit.
+        
+        Args:
+            cube_strings: Facelet strings to solve
+            workers: Number of processes (default: one per CPU)
+            use_symmetry: Passed through to solve()
+            
+        Returns:
+            One solve() result per input string, in order
+        """
+        solve = functools.partial(self.solve, use_symmetry=use_symmetry)
+        workers = min(workers or os.cpu_count() or 1, len(cube_strings))
+        if workers <= 1:
+            return [solve(cube_string) for cube_string in cube_strings]
+        
+        chunksize = max(1, len(cube_strings) // (4 * workers))
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers, initializer=self.warm_up) as pool:
+            return pool.map(solve, cube_strings, chunksize=chunksize)
+    
+    def validate_cube_string(self, cube_string: str) -> bool:
+        """
+        Check that a Kociemba facelet string is well formed.
+        
+        Returns:
+            True if it has 54 face letters with nine of each, False otherwise
+        """
+        if not isinstance(cube_string, str) or not _CUBE_STRING_RE.fullmatch(cube_string):
+            return False
+        return all(cube_string.count(face) == 9 for face in 'URFDLB')
     
     def _is_solved(self, cube_string: str) -> bool:
         """Check if the cube is in solved state."""
-
-        solved_pattern = "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
-        return cube_string == solved_pattern
+        return cube_string is _SOLVED_STATE or cube_string == _SOLVED_STATE
     
     def _cube_state_to_string(self, cube_state: CubeState) -> Optional[str]:
         """Convert CubeState to Kociemba format string."""
         try:
-            result = ""
-            
-            # Process faces in the order: U, R, F, D, L, B
-            face_order = ['U', 'R', 'F', 'D', 'L', 'B']
+            # Without a mapping every color is unknown (don't fall back to defaults)
+            if not cube_state.color_to_notation:
+                logger.error("❌ Color mapping not set")
+                return None
             
-            for face_name in face_order:
-                face_data = cube_state.get_face(face_name)
-                if not face_data:
-                    return None
-                
-                # Convert colors to notation
-                for row in face_data:
-                    for color in row:
-                        notation = cube_state.color_to_notation.get(color)
-                        if not notation:
-                            print(f"❌ Unknown color: {color}")
-                            return None
-                        result += notation
-            
-            return result
+            # Encoded in one pass with the translation table built for the mapping
+            return cube_state.to_kociemba_string() or None
             
         except Exception as e:
-            print(f"❌ Error converting cube state: {e}")
+            logger.error("❌ Error converting cube state: %s", e)
             return None
     
     def explain_solution(self, moves: List[str]) -> None:
@@ -132,13 +254,17 @@ class CubeSolver:
         print("=" * 50)
         
         for i, move in enumerate(moves, 1):
-            explanation = self.move_explanations.get(move, "Unknown move")
+            explanation = self.explain_move(move)
             print(f"  {i:2d}. {move:3s} - {explanation}")
         
         print("=" * 50)
         print("💡 TIP: Hold the cube with white on top and green facing you")
         print("💡 TIP: Clockwise means turning like a clock when looking at that face")
     
+    def explain_move(self, move: str) -> str:
+        """Get the plain-English description of a single move."""
+        return self.MOVE_EXPLANATIONS.get(move, "Unknown move")
+    
     def format_solution_compact(self, moves: List[str]) -> str:
         """Format solution as a compact string."""
         if not moves:
@@ -146,6 +272,16 @@ class CubeSolver:
         
         return " ".join(moves)
     
+    def get_move_count(self, solution) -> int:
+        """Count the moves in a solution (a Kociemba string or a list of moves)."""
+        if isinstance(solution, str):
+            return len(solution.split())
+        return len(solution)
+    
+    def is_optimal_solution(self, solution) -> bool:
+        """Check whether a solution is within God's number (20 moves)."""
+        return self.get_move_count(solution) <= 20
+    
     def get_solution_stats(self, moves: List[str]) -> dict:
         """Get statistics about the solution."""
         if not moves:
@@ -157,35 +293,17 @@ class CubeSolver:
                 'efficiency': 'Perfect'
             }
         
+        # Count move types
+        half_turns = sum(1 for move in moves if move.endswith('2'))
+        
         stats = {
             'total_moves': len(moves),
-            'quarter_turns': 0,
-            'half_turns': 0,
-            'face_usage': {},
-            'efficiency': 'Good'
+            'quarter_turns': len(moves) - half_turns,
+            'half_turns': half_turns,
+            'face_usage': Counter(move[0] for move in moves),
+            'efficiency': _EFF_LABELS[bisect.bisect_left(_EFF_BOUNDS, len(moves))]
         }
         
-        for move in moves:
-            # Count move types
-            if move.endswith('2'):
-                stats['half_turns'] += 1
-            else:
-                stats['quarter_turns'] += 1
-            
-            # Count face usage
-            face = move[0]
-            stats['face_usage'][face] = stats['face_usage'].get(face, 0) + 1
-        
-        # Determine efficiency
-        if stats['total_moves'] <= 15:
-            stats['efficiency'] = 'Excellent'
-        elif stats['total_moves'] <= 20:
-            stats['efficiency'] = 'Good'
-        elif stats['total_moves'] <= 25:
-            stats['efficiency'] = 'Fair'
-        else:
-            stats['efficiency'] = 'Could be better'
-        
         return stats
     
     def validate_solution(self, cube_state: CubeState, moves: List[str]) -> bool:
@@ -208,7 +326,7 @@ class CubeSolver:
             return moves is not None
             
         except Exception as e:
-            print(f"⚠️  Validation error: {e}")
+            logger.warning("⚠️  Validation error: %s", e)
             return False
     
     def print_solution_summary(self, moves: List[str]) -> None:
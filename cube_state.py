@@ -6,26 +6,92 @@ Represents and manages the complete state of a Rubik's cube.
 Handles color detection, validation, and conversion to standard notation.
 """
 
+import logging
+from collections import Counter
+import numpy as np
 from typing import List, Dict, Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
+
+# Faces in Kociemba order; each owns 9 consecutive facelets of the state array
+FACE_ORDER = ('U', 'R', 'F', 'D', 'L', 'B')
+FACE_OFFSETS = {face: i * 9 for i, face in enumerate(FACE_ORDER)}
+FACELET_ORDER = tuple((face, row, col) for face in FACE_ORDER for row in range(3) for col in range(3))
+CENTER_INDICES = np.array([4, 13, 22, 31, 40, 49])
+
+# Each face as (normal, column direction, row direction) in x=R, y=U, z=F
+# coordinates, matching the facelet numbering of the Kociemba string
+FACE_FRAMES = {
+    'U': ((0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    'R': ((1, 0, 0), (0, 0, -1), (0, -1, 0)),
+    'F': ((0, 0, 1), (1, 0, 0), (0, -1, 0)),
+    'D': ((0, -1, 0), (1, 0, 0), (0, 0, -1)),
+    'L': ((-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    'B': ((0, 0, -1), (-1, 0, 0), (0, -1, 0)),
+}
+
+# (position, normal) of every facelet -> its index in the state array
+FACELET_INDEX = {
+    (tuple(n + (col - 1) * c + (row - 1) * r for n, c, r in zip(*FACE_FRAMES[face])), FACE_FRAMES[face][0]):
+        FACE_OFFSETS[face] + row * 3 + col
+    for face, row, col in FACELET_ORDER
+}
+
+
+def facelet_permutation(matrix, layer=None) -> np.ndarray:
+    """
+    Source facelet of each facelet after a rotation (for state[perm]).
+    
+    Args:
+        matrix: 3x3 integer rotation matrix
+        layer: Face normal; only the facelets in that face's layer turn
+            (default: the whole cube)
+    """
+    matrix = np.asarray(matrix)
+    perm = np.arange(54)
+    for (position, normal), i in FACELET_INDEX.items():
+        if layer is None or np.dot(position, layer) > 0:
+            perm[FACELET_INDEX[tuple((matrix @ position).tolist()), tuple((matrix @ normal).tolist())]] = i
+    return perm
+
+
+def _move_permutations() -> Dict[str, np.ndarray]:
+    """Permutations for all 18 face turns (X, X' and X2 for each face)."""
+    moves = {}
+    for face, (normal, _, _) in FACE_FRAMES.items():
+        # Clockwise seen from outside = -90 degrees about the face normal
+        x, y, z = normal
+        cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+        quarter = facelet_permutation(np.eye(3, dtype=int) - cross + cross @ cross, normal)
+        moves[face] = quarter
+        moves[face + '2'] = quarter[quarter]
+        moves[face + "'"] = quarter[quarter][quarter]
+    return moves
+
+
+MOVE_PERMUTATIONS = _move_permutations()
+
+# Color codes stored in the state array (color_detector.COLOR_NAMES is this tuple)
+COLORS = ('white', 'red', 'green', 'yellow', 'orange', 'blue')
+EMPTY = 255  # Facelet not scanned yet
+
 
 class CubeState:
     """Represents the complete state of a Rubik's cube."""
     
     def __init__(self):
         """Initialize empty cube state."""
-        # Store face data as 3x3 grids of color names
-        self.faces = {
-            'U': [['', '', ''], ['', '', ''], ['', '', '']],  # Up (top)
-            'R': [['', '', ''], ['', '', ''], ['', '', '']],  # Right
-            'F': [['', '', ''], ['', '', ''], ['', '', '']],  # Front
-            'D': [['', '', ''], ['', '', ''], ['', '', '']],  # Down (bottom)
-            'L': [['', '', ''], ['', '', ''], ['', '', '']],  # Left
-            'B': [['', '', ''], ['', '', ''], ['', '', '']]   # Back
-        }
+        # All 54 facelets as color codes: U1-U9, R1-R9, F1-F9, D1-D9, L1-L9, B1-B9
+        self.state = np.full(54, EMPTY, dtype=np.uint8)
+        
+        # Color name <-> code; names outside COLORS get the next free code
+        self._color_names = list(COLORS)
+        self._color_to_int = {color: code for code, color in enumerate(COLORS)}
         
         # This will be set based on detected center colors
         self.color_to_notation = {}
+        self._notation_table = None
         
         # Default mapping (will be overridden by actual detection)
         self._default_color_mapping = {
@@ -48,42 +114,110 @@ class CubeState:
         self.color_to_notation = {}
         for face_notation, color_name in face_color_mapping.items():
             self.color_to_notation[color_name] = face_notation
+        self._build_notation_table()
         
-        print(f"🎯 Updated color mapping: {self.color_to_notation}")
+        logger.info("🎯 Updated color mapping: %s", self.color_to_notation)
     
-    def set_face(self, face_name: str, colors: List[List[str]]) -> bool:
+    def _build_notation_table(self):
+        """
+        Build a bytes.translate table from color code to notation letter.
+        
+        Codes without a mapping translate to 0 so they can be detected.
+        """
+        table = bytearray(256)
+        for color_name, notation in self.color_to_notation.items():
+            table[self._color_code(color_name)] = ord(notation)
+        self._notation_table = bytes(table)
+    
+    def _color_code(self, color_name: str) -> int:
+        """Get the code for a color name, registering unseen names."""
+        if not color_name:
+            return EMPTY
+        
+        code = self._color_to_int.get(color_name)
+        if code is None:
+            code = len(self._color_names)
+            self._color_names.append(color_name)
+            self._color_to_int[color_name] = code
+        return code
+    
+    def _color_name(self, code: int) -> str:
+        """Get the color name for a code ('' for EMPTY)."""
+        return '' if code == EMPTY else self._color_names[code]
+    
+    @property
+    def faces(self) -> Dict[str, List[List[str]]]:
+        """All faces as 3x3 grids of color names (a decoded copy)."""
+        return {face_name: self.get_face(face_name) for face_name in FACE_ORDER}
+    
+    def set_face(self, face_name: str, colors) -> bool:
         """
         Set the colors for a specific face.
         
+        The grid is encoded straight into the state array; nothing keeps a
+        reference to it, so the caller may reuse or mutate it afterwards.
+        
         Args:
             face_name: Face identifier ('U', 'R', 'F', 'D', 'L', 'B')
-            colors: 3x3 grid of color names
+            colors: 3x3 grid of color names, or a 3x3 uint8 array of color
+                codes (indices into COLORS) which is copied as-is
             
         Returns:
             True if successful, False otherwise
         """
-        if face_name not in self.faces:
-            print(f"❌ Invalid face name: {face_name}")
+        if face_name not in FACE_OFFSETS:
+            logger.error("❌ Invalid face name: %s", face_name)
             return False
         
         if len(colors) != 3 or any(len(row) != 3 for row in colors):
-            print(f"❌ Invalid color grid size for face {face_name}")
+            logger.error("❌ Invalid color grid size for face %s", face_name)
             return False
         
-        self.faces[face_name] = [row[:] for row in colors]  # Deep copy
+        offset = FACE_OFFSETS[face_name]
+        if isinstance(colors, np.ndarray) and colors.dtype == np.uint8:
+            # Already color codes (e.g. from ColorDetector.process_face_codes)
+            codes = colors.ravel()
+            unknown = (codes >= len(self._color_names)) & (codes != EMPTY)
+            if unknown.any():
+                logger.error("❌ Invalid color codes for face %s: %s", face_name, sorted(set(codes[unknown].tolist())))
+                return False
+            self.state[offset:offset + 9] = codes
+        else:
+            self.state[offset:offset + 9] = [self._color_code(color) for row in colors for color in row]
+        return True
+    
+    def apply_move(self, move: str) -> bool:
+        """
+        Turn one face of the cube.
+        
+        Args:
+            move: Face turn in standard notation (e.g. "R", "U'", "F2")
+            
+        Returns:
+            True if successful, False for an unknown move
+        """
+        perm = MOVE_PERMUTATIONS.get(move)
+        if perm is None:
+            logger.error("❌ Invalid move: %s", move)
+            return False
+        
+        self.state[:] = self.state[perm]
         return True
     
     def get_face(self, face_name: str) -> Optional[List[List[str]]]:
         """Get the colors for a specific face."""
-        return self.faces.get(face_name)
+        offset = FACE_OFFSETS.get(face_name)
+        if offset is None:
+            return None
+        
+        names = [self._color_name(code) for code in self.state[offset:offset + 9].tolist()]
+        return [names[0:3], names[3:6], names[6:9]]
     
     def get_center_colors(self) -> Dict[str, str]:
         """Get the center color of each face."""
-        centers = {}
-        for face_name, face_data in self.faces.items():
-            if face_data[1][1]:  # Center square at position [1][1]
-                centers[face_name] = face_data[1][1]
-        return centers
+        centers = self.state[CENTER_INDICES].tolist()
+        return {face_name: self._color_name(code)
+                for face_name, code in zip(FACE_ORDER, centers) if code != EMPTY}
     
     def to_kociemba_string(self) -> str:
         """
@@ -98,34 +232,40 @@ class CubeState:
         7 8 9
         """
         if not self.color_to_notation:
-            print("❌ Color mapping not set. Using default mapping.")
+            logger.warning("❌ Color mapping not set. Using default mapping.")
             self.color_to_notation = self._default_color_mapping.copy()
+            self._build_notation_table()
         
-        result = ""
+        # The state is already in Kociemba order: translate all 54 codes at once
+        result = self.state.tobytes().translate(self._notation_table)
         
-        # Process faces in Kociemba order: U, R, F, D, L, B
-        face_order = ['U', 'R', 'F', 'D', 'L', 'B']
-        
-        for face_name in face_order:
-            face_data = self.faces[face_name]  # 3x3 grid
-            
-            # Convert 3x3 grid to 9 characters in correct order
-            # Row 0: positions 1, 2, 3
-            # Row 1: positions 4, 5, 6
-            # Row 2: positions 7, 8, 9
-            for row_idx in range(3):
-                for col_idx in range(3):
-                    color_name = face_data[row_idx][col_idx]
-                    
-                    if color_name not in self.color_to_notation:
-                        print(f"❌ Unknown color: {color_name}")
-                        print(f"Available mappings: {self.color_to_notation}")
-                        return ""
-                    
-                    notation = self.color_to_notation[color_name]
-                    result += notation
+        if 0 in result:
+            unmapped = np.frombuffer(result, dtype=np.uint8) == 0
+            unknown = sorted({self._color_name(code) for code in self.state[unmapped].tolist()})
+            logger.error("❌ Unknown color: %s", ', '.join(unknown))
+            logger.error("Available mappings: %s", self.color_to_notation)
+            return ""
         
-        return result
+        return result.decode('ascii')
+    
+    def _color_counts(self) -> np.ndarray:
+        """Occurrences of each color code, with unscanned facelets not counted."""
+        counts = np.bincount(self.state, minlength=EMPTY + 1)
+        counts[EMPTY] = 0
+        return counts
+    
+    def _centers_distinct(self) -> bool:
+        """Check that the six centers all have different colors."""
+        return len(set(self.state[CENTER_INDICES].tolist())) == 6
+    
+    def is_valid(self) -> bool:
+        """
+        Check the cube without logging: 6 colors with 9 facelets each, and
+        a different color on every center.
+        """
+        counts = self._color_counts()
+        used = np.flatnonzero(counts)
+        return used.size == 6 and bool((counts[used] == 9).all()) and self._centers_distinct()
     
     def validate(self) -> bool:
         """
@@ -134,49 +274,36 @@ class CubeState:
         Returns:
             True if valid, False otherwise
         """
-        print("🔍 Validating cube state...")
-        
-        # Check that all faces have data
-        for face_name in ['U', 'R', 'F', 'D', 'L', 'B']:
-            if not self.faces[face_name]:
-                print(f"❌ Face {face_name} has no data")
-                return False
-            
-            # Check face structure
-            face_data = self.faces[face_name]
-            if len(face_data) != 3 or any(len(row) != 3 for row in face_data):
-                print(f"❌ Face {face_name} has invalid structure")
-                return False
-        
-        # Count total colors
-        all_colors = []
-        for face_data in self.faces.values():
-            for row in face_data:
-                for color in row:
-                    if color:  # Skip empty strings
-                        all_colors.append(color)
-        
-        # Count occurrences of each color
-        color_counts = {}
-        for color in all_colors:
-            color_counts[color] = color_counts.get(color, 0) + 1
-        
-        print(f"📊 Total color distribution: {color_counts}")
+        # Quiet fast path: nothing to report for a valid cube
+        if not logger.isEnabledFor(logging.INFO) and self.is_valid():
+            return True
         
         # Validate color distribution
         expected_colors = 6
         expected_count_per_color = 9
         
+        counts = self._color_counts()
+        used = np.flatnonzero(counts)
+        
+        logger.info("🔍 Validating cube state...")
+        
+        color_counts = {self._color_names[code]: int(counts[code]) for code in used.tolist()}
+        logger.info("📊 Total color distribution: %s", color_counts)
+        
         if len(color_counts) != expected_colors:
-            print(f"❌ Expected {expected_colors} colors, found {len(color_counts)}: {list(color_counts.keys())}")
+            logger.error("❌ Expected %d colors, found %d: %s", expected_colors, len(color_counts), list(color_counts.keys()))
             return False
         
         for color, count in color_counts.items():
             if count != expected_count_per_color:
-                print(f"❌ Color '{color}' appears {count} times (expected {expected_count_per_color})")
+                logger.error("❌ Color '%s' appears %d times (expected %d)", color, count, expected_count_per_color)
                 return False
         
-        print("✅ Cube state validation passed!")
+        if not self._centers_distinct():
+            logger.error("❌ Center colors are not all different: %s", self.get_center_colors())
+            return False
+        
+        logger.info("✅ Cube state validation passed!")
         return True
     
     def print_state(self):
@@ -184,66 +311,67 @@ class CubeState:
         print("\n🎲 CUBE STATE:")
         print("=" * 40)
         
-        for face_name in ['U', 'R', 'F', 'D', 'L', 'B']:
-            face_data = self.faces[face_name]
+        for face_name in FACE_ORDER:
+            face_data = self.get_face(face_name)
             print(f"\n{face_name} Face:")
             for row in face_data:
                 row_str = " | ".join(f"{color:^8}" for color in row)
                 print(f"  {row_str}")
     
     def debug_string_generation(self) -> str:
-        """Debug the string generation process step by step."""
-        print("\n🔍 DEBUG: STRING GENERATION PROCESS")
-        print("=" * 50)
+        """
+        Debug the string generation process step by step.
         
+        The per-facelet walk only runs when DEBUG logging is enabled;
+        otherwise this is just to_kociemba_string().
+        """
         if not self.color_to_notation:
-            print("❌ No color mapping available!")
+            logger.error("❌ No color mapping available!")
             return ""
         
-        print(f"Color mapping: {self.color_to_notation}")
-        print()
+        if not logger.isEnabledFor(logging.DEBUG):
+            return self.to_kociemba_string()
+        
+        logger.debug("🔍 DEBUG: STRING GENERATION PROCESS")
+        logger.debug("Color mapping: %s", self.color_to_notation)
         
-        result = ""
-        face_order = ['U', 'R', 'F', 'D', 'L', 'B']
+        faces = self.faces
+        notations = []
         
-        for face_idx, face_name in enumerate(face_order):
-            print(f"Face {face_name} (positions {face_idx*9 + 1}-{face_idx*9 + 9}):")
-            face_data = self.faces[face_name]
+        for position, (face_name, row_idx, col_idx) in enumerate(FACELET_ORDER, 1):
+            if row_idx == col_idx == 0:
+                logger.debug("Face %s (positions %d-%d):", face_name, position, position + 8)
             
-            face_string = ""
-            for row_idx in range(3):
-                for col_idx in range(3):
-                    color_name = face_data[row_idx][col_idx]
-                    notation = self.color_to_notation.get(color_name, '?')
-                    face_string += notation
-                    
-                    position = face_idx * 9 + row_idx * 3 + col_idx + 1
-                    print(f"  Position {position:2d}: {color_name:8} -> {notation}")
+            color_name = faces[face_name][row_idx][col_idx]
+            notation = self.color_to_notation.get(color_name, '?')
+            notations.append(notation)
+            logger.debug("  Position %2d: %-8s -> %s", position, color_name, notation)
             
-            result += face_string
-            print(f"  Face string: {face_string}")
-            print()
+            if row_idx == col_idx == 2:
+                logger.debug("  Face string: %s", ''.join(notations[-9:]))
         
-        print(f"Final string: {result}")
-        print(f"Length: {len(result)} (should be 54)")
+        result = ''.join(notations)
+        logger.debug("Final string: %s", result)
+        logger.debug("Length: %d (should be 54)", len(result))
         
         return result
 
     def get_cube_string_debug(self) -> str:
-        """Get cube string with debug info."""
+        """Get cube string with debug info (logged at DEBUG level)."""
         cube_string = self.to_kociemba_string()
         
-        print(f"Cube string: {cube_string}")
-        print(f"Length: {len(cube_string)}")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return cube_string
+        
+        logger.debug("Cube string: %s", cube_string)
+        logger.debug("Length: %d", len(cube_string))
         
         # Character frequency analysis
-        char_counts = {}
-        for char in cube_string:
-            char_counts[char] = char_counts.get(char, 0) + 1
+        char_counts = Counter(cube_string)
         
-        print("Character frequency:")
+        logger.debug("Character frequency:")
         for char in sorted(char_counts.keys()):
             status = "✅" if char_counts[char] == 9 else "❌"
-            print(f"  {char}: {char_counts[char]} times {status}")
+            logger.debug("  %s: %d times %s", char, char_counts[char], status)
         
         return cube_string
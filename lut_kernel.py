@@ -0,0 +1,37 @@
+"""
+LUT Kernel
+==========
+
+Numba-compiled builder for the ColorDetector HSV lookup table.
+Only imported on a lookup-table cache miss, and only works when Numba is
+installed; color_detector falls back to NumPy otherwise.
+"""
+
+import types
+from numba import njit, prange
+
+import color_detector
+
+
+def _jit_copy(func, namespace: dict):
+    """Compile a copy of func that looks up its globals in namespace."""
+    copy = types.FunctionType(func.__code__, namespace, func.__name__, func.__defaults__)
+    return njit(cache=True)(copy)
+
+
+# color_detector's rule tree compiled to native code (cache=True keeps the
+# machine code across runs). The copies call each other through their own
+# namespace, so color_detector's plain-Python functions are left untouched.
+_rules = dict(vars(color_detector))
+_rules['_hsv_distance'] = _jit_copy(color_detector._hsv_distance, _rules)
+_rules['_classify_pixel'] = _jit_copy(color_detector._classify_pixel, _rules)
+_classify_pixel = _rules['_classify_pixel']
+
+
+@njit(parallel=True, cache=True)
+def fill_lut(ref_hsv, lut):
+    """Classify every (H, S, V) cell of lut in place, hue planes in parallel."""
+    for h in prange(lut.shape[0]):
+        for s in range(lut.shape[1]):
+            for v in range(lut.shape[2]):
+                lut[h, s, v] = _classify_pixel(h, s, v, ref_hsv)
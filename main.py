@@ -7,14 +7,38 @@ Complete application for scanning and solving Rubik's cubes using computer visio
 and the Kociemba algorithm.
 """
 
+import argparse
+import logging
+import sys
+import threading
+
 from cube_scanner import CubeScanner
 from color_detector import ColorDetector
 from cube_state import CubeState
 from cube_solver import CubeSolver
 
+logger = logging.getLogger(__name__)
+
 
-def main():
+def main(argv=None):
     """Main application function."""
+    parser = argparse.ArgumentParser(description="Scan and solve a Rubik's cube with your webcam.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--fast', action='store_true',
+                        help="skip the debug and visualization output; just print the solution")
+    output.add_argument('--debug', action='store_true',
+                        help="also show the facelet-by-facelet string generation and cube string analysis")
+    args = parser.parse_args(argv)
+    
+    # Solver/state progress goes through logging; show it like regular output
+    if args.debug:
+        level = logging.DEBUG
+    elif args.fast:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+    
     print("🎲 RUBIK'S CUBE SOLVER")
     print("=" * 30)
     print("Welcome to the AI-powered Rubik's Cube Solver!")
@@ -24,9 +48,14 @@ def main():
     # Initialize components
     scanner = CubeScanner()
     detector = ColorDetector()
+    detector.verbose = not args.fast  # Interactive run: show per-face debug and the 2D net
     cube_state = CubeState()
     solver = CubeSolver()
     
+    # Load the solver tables while the user is busy scanning
+    warm_up = threading.Thread(target=solver.warm_up, daemon=True)
+    warm_up.start()
+    
     try:
         # Step 1: Scan the cube
         print("📹 Step 1: Scanning cube faces...")
@@ -48,35 +77,39 @@ def main():
         # Process each face - CRITICAL: Match scanner sequence exactly
         face_names = ['U', 'R', 'F', 'D', 'L', 'B']  # Same order as scanner
         
-        for i, face_name in enumerate(face_names):
-            # Get the scanned data in the same order as face_names
-            face_key = f"face_{i+1}"  # Scanner stores as "face_1", "face_2", etc.
-            
+        # Get the scanned data in the same order as face_names
+        face_keys = [f"face_{i+1}" for i in range(len(face_names))]  # Scanner stores as "face_1", "face_2", etc.
+        
+        for face_name, face_key in zip(face_names, face_keys):
             if face_key not in face_data:
                 print(f"❌ Missing data for {face_name} (key: {face_key})")
                 return
-            
-            face_bgr_colors = face_data[face_key]
-            
-            # Convert BGR to color names
-            face_colors = detector.process_face_colors(face_bgr_colors)
-            
+        
+        # Classify all six faces in one batch, straight to color codes
+        all_face_codes = detector.process_face_codes([face_data[key] for key in face_keys])
+        
+        for face_name, face_codes in zip(face_names, all_face_codes):
             # Set face in cube state
-            success = cube_state.set_face(face_name, face_colors)
+            success = cube_state.set_face(face_name, face_codes)
             if not success:
                 print(f"❌ Failed to set colors for face {face_name}")
                 return
             
-            # Debug output
-            detector.print_face_debug(face_name, face_colors)
+            # Debug output (color names decoded only when shown)
+            if detector.verbose:
+                detector.print_face_debug(face_name, cube_state.get_face(face_name))
+        
+        # Encode the cube once; the debug dumps and the solver reuse it
+        cube_string = cube_state.to_kociemba_string()
         
         # DEBUG: Show detailed string generation
-        print("\n🔍 DETAILED STRING GENERATION:")
-        debug_string = cube_state.debug_string_generation()
-        print(debug_string)
+        if logger.isEnabledFor(logging.DEBUG):
+            print("\n🔍 DETAILED STRING GENERATION:")
+            cube_state.debug_string_generation()
         
-        # STEP 2.5: VISUALIZE THE SCANNED CUBE
-        print("\n📱 Step 2.5: Visualizing scanned cube...")
+        # STEP 2.5: VISUALIZE THE SCANNED CUBE (only the center check in fast mode)
+        if not args.fast:
+            print("\n📱 Step 2.5: Visualizing scanned cube...")
         centers_valid = detector.visualize_cube_2d(cube_state)
 
         if not centers_valid:
@@ -102,13 +135,17 @@ def main():
         print("✅ Cube state is valid!")
         
         # Debug: Show the cube string with face analysis
-        print(f"\n🔤 Cube string analysis:")
-        print(cube_state.get_cube_string_debug())
+        if not args.fast:
+            print(f"\n🔤 Cube string: {cube_string}")
+        if logger.isEnabledFor(logging.DEBUG):
+            cube_state.get_cube_string_debug()
         
         # Step 4: Solve the cube
         print("\n🧠 Step 4: Computing optimal solution...")
         
-        solution = solver.solve_cube(cube_state)
+        # kociemba's table setup isn't thread-safe: let the warm-up finish first
+        warm_up.join()
+        solution = solver.solve_cube(cube_state, cube_string)
         
         if solution is None:
             print("❌ Failed to find a solution. The cube might be in an invalid state.")
@@ -116,6 +153,10 @@ def main():
             return
         
         # Step 5: Present the solution
+        if args.fast:
+            print(f"🔄 Solution: {solver.format_solution_compact(solution)}")
+            return
+        
         print("\n🎉 Step 5: Solution ready!")
         
         if not solution:  # Empty list means already solved
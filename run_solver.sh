@@ -18,4 +18,4 @@ echo "🚀 Starting Rubik's Cube Solver..."
 echo "Make sure your webcam is connected and working!"
 echo ""
 
-.venv/bin/python main.py
+.venv/bin/python main.py "$@"
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Solver Benchmarks
+=================
+
+pytest-benchmark timings for the Kociemba solve path. Skipped when
+pytest-benchmark isn't installed; run with --benchmark-disable to execute
+each benchmark once as a plain test.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from cube_solver import _cached_solve
+from test_solver import _make_scramble, _solves_scramble, get_solver
+
+pytestmark = pytest.mark.performance
+
+
+@pytest.mark.parametrize("use_symmetry", [False, True], ids=["one-axis", "three-axis"])
+def test_solve_benchmark(benchmark, use_symmetry):
+    """Time solver.solve on the test scramble, one axis vs three."""
+    solver = get_solver()
+    scrambled_cube = _make_scramble(0)
+    assert solver.validate_cube_string(scrambled_cube)
+    solver.warm_up()
+    
+    # Clear the solve cache before each round so every round runs the search
+    benchmark.group = "kociemba-solve"
+    solution = benchmark.pedantic(solver.solve, args=(scrambled_cube,),
+                                  kwargs={'use_symmetry': use_symmetry},
+                                  setup=_cached_solve.cache_clear, rounds=20, warmup_rounds=1)
+    
+    # The solution must actually solve the scramble
+    assert _solves_scramble(0, solution)
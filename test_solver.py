@@ -7,52 +7,148 @@ This script tests the basic functionality of all modules
 without requiring a webcam or physical cube.
 """
 
+import contextlib
+import functools
+import io
+import os
+import random
+import subprocess
 import sys
-from color_detector import ColorDetector
-from cube_state import CubeState
-from cube_solver import CubeSolver
+import tempfile
+from typing import TYPE_CHECKING
+import numpy as np
+
+# The project modules are imported inside the functions that use them, so
+# running a single test doesn't load OpenCV or kociemba unless it needs them
+if TYPE_CHECKING:
+    from color_detector import ColorDetector
+    from cube_state import CubeState
+    from cube_solver import CubeSolver
+
+
+# Test solved cube state (set_face only reads the grids, so they can be shared)
+_SOLVED_FACES = {
+    face_name: ((color,) * 3,) * 3
+    for face_name, color in [
+        ('U', 'white'),      # White top
+        ('D', 'yellow'),     # Yellow bottom
+        ('R', 'red'),        # Red right
+        ('L', 'orange'),     # Orange left
+        ('F', 'blue'),       # Blue front
+        ('B', 'green'),      # Green back
+    ]
+}
+
+
+# Expected Kociemba string for the solved cube
+_EXPECTED_SOLVED_KOCIEMBA = "U" * 9 + "R" * 9 + "F" * 9 + "D" * 9 + "L" * 9 + "B" * 9
+
+# Kociemba string after a single R turn of the solved cube
+_AFTER_R_KOCIEMBA = "UUFUUFUUFRRRRRRRRRFFDFFDFFDDDBDDBDDBLLLLLLLLLUBBUBBUBB"
+
+# Face colors of the solved cube that test scrambles start from
+_SCRAMBLE_COLORS = {'U': 'white', 'R': 'red', 'F': 'green', 'D': 'yellow', 'L': 'orange', 'B': 'blue'}
+
+# Sample BGR colors for the color detector and the color each should map to
+_TEST_BGR = np.array([
+    [255, 255, 255],  # White
+    [0, 255, 255],    # Yellow
+    [0, 0, 255],      # Red
+    [0, 165, 255],    # Orange
+    [255, 0, 0],      # Blue
+    [0, 255, 0],      # Green
+], dtype=np.uint8)
+_TEST_NAMES = np.array(['white', 'yellow', 'red', 'orange', 'blue', 'green'])
+
+# All 18 face turns, each right-aligned to three characters for the listing
+_ALL_MOVES = [f"{face}{suffix}" for face in "URFDLB" for suffix in ("", "'", "2")]
+_PAD = {move: move.rjust(3) for move in _ALL_MOVES}
+
+
+def _scrambled_cube(seed: int, depth: int = 25) -> "CubeState":
+    """Solved cube turned by `depth` random moves (the same moves for a given seed)."""
+    from cube_state import CubeState
+    cube = CubeState()
+    cube.update_color_mapping(_SCRAMBLE_COLORS)
+    for face_name, color in _SCRAMBLE_COLORS.items():
+        cube.set_face(face_name, ((color,) * 3,) * 3)
+    
+    for move in random.Random(seed).choices(_ALL_MOVES, k=depth):
+        cube.apply_move(move)
+    return cube
+
+
+def _make_scramble(seed: int, depth: int = 25) -> str:
+    """Kociemba string of a seeded random scramble."""
+    return _scrambled_cube(seed, depth).to_kociemba_string()
+
+
+def _solves_scramble(seed: int, solution) -> bool:
+    """Replay a solution on the seeded scramble and check it ends solved."""
+    if solution is None:
+        return False
+    cube = _scrambled_cube(seed)
+    if not all(cube.apply_move(move) for move in solution.split()):
+        return False
+    return cube.to_kociemba_string() == _EXPECTED_SOLVED_KOCIEMBA
+
+
+@functools.lru_cache(maxsize=None)
+def get_detector() -> "ColorDetector":
+    """Shared ColorDetector (its lookup table is built or loaded once)."""
+    from color_detector import ColorDetector
+    return ColorDetector()
+
+
+@functools.lru_cache(maxsize=None)
+def get_solver() -> "CubeSolver":
+    """Shared CubeSolver, so solver state stays warm between tests."""
+    from cube_solver import CubeSolver
+    return CubeSolver()
+
+
+def _buffered(test):
+    """Collect a test's output and write it to stdout in one go."""
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                return test(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+    return wrapper
 
 
+@_buffered
 def test_color_detector():
     """Test the color detection functionality."""
     print("🧪 Testing Color Detector...")
-    detector = ColorDetector()
-    
-    # Test some sample BGR colors
-    test_colors = [
-        ((255, 255, 255), "white"),  # White
-        ((0, 255, 255), "yellow"),   # Yellow  
-        ((0, 0, 255), "red"),        # Red
-        ((0, 165, 255), "orange"),   # Orange
-        ((255, 0, 0), "blue"),       # Blue
-        ((0, 255, 0), "green")       # Green
-    ]
+    detector = get_detector()
+    
+    # Classify every sample in one batch; only mismatches are listed
+    detected_colors = detector.detect_colors_batch(_TEST_BGR)
+    mismatches = np.flatnonzero(detected_colors != _TEST_NAMES)
     
-    for bgr_color, expected in test_colors:
-        detected = detector.detect_color(bgr_color)
-        status = "✅" if detected == expected else "❌"
-        print(f"  {status} BGR {bgr_color} -> {detected} (expected: {expected})")
+    for i in mismatches.tolist():
+        print(f"  ❌ BGR {tuple(_TEST_BGR[i].tolist())} -> {detected_colors[i]} (expected: {_TEST_NAMES[i]})")
+    
+    all_match = mismatches.size == 0
+    print(f"  {'✅' if all_match else '❌'} All samples match: {all_match} "
+          f"({len(_TEST_NAMES) - mismatches.size}/{len(_TEST_NAMES)})")
     
     print("✅ Color Detector test completed\n")
 
 
+@_buffered
 def test_cube_state():
     """Test the cube state management."""
     print("🧪 Testing Cube State...")
+    from cube_state import CubeState
     cube = CubeState()
     
-    # Create a test solved cube state
-    solved_faces = {
-        'U': [['white'] * 3 for _ in range(3)],      # White top
-        'D': [['yellow'] * 3 for _ in range(3)],     # Yellow bottom
-        'R': [['red'] * 3 for _ in range(3)],        # Red right
-        'L': [['orange'] * 3 for _ in range(3)],     # Orange left
-        'F': [['blue'] * 3 for _ in range(3)],       # Blue front
-        'B': [['green'] * 3 for _ in range(3)]       # Green back
-    }
-    
-    # Set all faces
-    for face_name, colors in solved_faces.items():
+    # Set all faces of the test solved cube
+    for face_name, colors in _SOLVED_FACES.items():
         cube.set_face(face_name, colors)
     
     # Test validation
@@ -62,23 +158,58 @@ def test_cube_state():
     # Test Kociemba string conversion
     if is_valid:
         kociemba_string = cube.to_kociemba_string()
-        expected_solved = "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
+        expected_solved = _EXPECTED_SOLVED_KOCIEMBA
         is_correct = kociemba_string == expected_solved
         print(f"  {'✅' if is_correct else '❌'} Kociemba format: {is_correct}")
         print(f"  Generated: {kociemba_string}")
         print(f"  Expected:  {expected_solved}")
     
+    # Codes that are neither a known color nor EMPTY are rejected
+    is_rejected = not cube.set_face('U', np.full((3, 3), 9, dtype=np.uint8))
+    print(f"  {'✅' if is_rejected else '❌'} Unknown color codes rejected: {is_rejected}")
+    assert is_rejected
+    
     print("✅ Cube State test completed\n")
 
 
+@_buffered
+def test_apply_move():
+    """Test face turns on the cube state."""
+    print("🧪 Testing Face Turns...")
+    
+    # A known single turn from the solved cube
+    cube = _scrambled_cube(0, depth=0)
+    cube.apply_move("R")
+    after_r = cube.to_kociemba_string()
+    is_correct = after_r == _AFTER_R_KOCIEMBA
+    print(f"  {'✅' if is_correct else '❌'} R on solved cube: {after_r}")
+    assert is_correct, f"R on solved cube gave {after_r}"
+    
+    # Every move followed by its inverse gives back the starting state
+    cube = _scrambled_cube(1)
+    start = cube.to_kociemba_string()
+    for move in _ALL_MOVES:
+        inverse = move[0] + {"": "'", "'": "", "2": "2"}[move[1:]]
+        assert cube.apply_move(move) and cube.apply_move(inverse)
+        assert cube.to_kociemba_string() == start, f"{move} {inverse} is not the identity"
+    print(f"  ✅ Move then inverse is the identity for all {len(_ALL_MOVES)} moves")
+    
+    # Unknown moves are rejected and leave the state alone
+    is_rejected = not cube.apply_move("X") and cube.to_kociemba_string() == start
+    print(f"  {'✅' if is_rejected else '❌'} Unknown move rejected: {is_rejected}")
+    assert is_rejected
+    
+    print("✅ Face Turns test completed\n")
+
+
+@_buffered
 def test_cube_solver():
     """Test the cube solver functionality."""
     print("🧪 Testing Cube Solver...")
-    solver = CubeSolver()
+    solver = get_solver()
     
     # Test with a scrambled but solvable cube state
-    # This is a known valid scrambled state
-    scrambled_cube = "DUUBULDBFRBFRRULLLBRDFFFBLURDBFDFDRFRULBLUFDURRBLBDUDL"
+    scrambled_cube = _make_scramble(0)  # seed 0, for _solves_scramble below
     
     print(f"  Testing with scrambled state: {scrambled_cube}")
     
@@ -87,6 +218,9 @@ def test_cube_solver():
     print(f"  {'✅' if is_valid_format else '❌'} String format validation: {is_valid_format}")
     
     if is_valid_format:
+        # Load the solver tables first so the solve below is pure search
+        solver.warm_up()
+        
         # Try to solve
         print("  🧠 Attempting to solve...")
         solution = solver.solve(scrambled_cube)
@@ -97,22 +231,77 @@ def test_cube_solver():
             is_optimal = solver.is_optimal_solution(solution)
             print(f"  📊 Move count: {move_count}")
             print(f"  🎯 Optimal (≤20): {is_optimal}")
+            
+            # Searching along all three axes should never do worse
+            symmetric_solution = solver.solve(scrambled_cube, use_symmetry=True)
+            symmetric_count = solver.get_move_count(symmetric_solution)
+            no_longer = symmetric_count <= move_count
+            print(f"  {'✅' if no_longer else '❌'} Three-axis solution: {symmetric_solution} ({symmetric_count} moves)")
+            assert no_longer, f"three-axis solution has {symmetric_count} moves, one-axis {move_count}"
+            assert _solves_scramble(0, symmetric_solution), "three-axis solution doesn't solve the scramble"
         else:
             print("  ❌ No solution found")
     
     print("✅ Cube Solver test completed\n")
 
 
+@_buffered
+def test_solve_many():
+    """Test batch solving in worker processes."""
+    print("🧪 Testing Batch Solve...")
+    solver = get_solver()
+    
+    # Solve seeded scrambles in two workers, then replay each solution
+    seeds = range(8)
+    solutions = solver.solve_many([_make_scramble(seed) for seed in seeds], workers=2)
+    solved = [_solves_scramble(seed, solution) for seed, solution in zip(seeds, solutions)]
+    print(f"  {'✅' if all(solved) else '❌'} Batch solve: {sum(solved)}/{len(seeds)} scrambles solved")
+    assert all(solved), f"unsolved scrambles: {[seed for seed, ok in zip(seeds, solved) if not ok]}"
+    
+    print("✅ Batch Solve test completed\n")
+
+
+# Build the color LUT from a cold cache (starting Numba's threads when it is
+# installed), then batch-solve; run in a fresh interpreter by the test below
+_LUT_THEN_SOLVE_MANY = f"""
+import contextlib, io
+from color_detector import ColorDetector
+from cube_solver import CubeSolver
+with contextlib.redirect_stdout(io.StringIO()):
+    ColorDetector()
+print(CubeSolver().solve_many([{_EXPECTED_SOLVED_KOCIEMBA!r}] * 2, workers=2))
+"""
+
+
+@_buffered
+def test_solve_many_after_lut_build():
+    """Test that a batch solve after a LUT build exits cleanly."""
+    print("🧪 Testing Batch Solve After LUT Build...")
+    
+    with tempfile.TemporaryDirectory() as cache_home:
+        env = dict(os.environ, XDG_CACHE_HOME=cache_home)
+        result = subprocess.run([sys.executable, "-c", _LUT_THEN_SOLVE_MANY],
+                                cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                                capture_output=True, text=True, timeout=300)
+    
+    exited_cleanly = result.returncode == 0 and result.stdout.strip() == "['', '']"
+    print(f"  {'✅' if exited_cleanly else '❌'} Process exited cleanly: {exited_cleanly}")
+    assert exited_cleanly, result.stderr
+    
+    print("✅ Batch Solve After LUT Build test completed\n")
+
+
+@_buffered
 def test_move_explanations():
     """Test move explanation functionality."""
     print("🧪 Testing Move Explanations...")
-    solver = CubeSolver()
+    solver = get_solver()
     
     test_moves = ["U", "U'", "U2", "R", "F'", "D2"]
     
     for move in test_moves:
         explanation = solver.explain_move(move)
-        print(f"  {move:>3} -> {explanation}")
+        print(f"  {_PAD[move]} -> {explanation}")
     
     print("✅ Move Explanations test completed\n")
 
@@ -126,14 +315,18 @@ def main():
     try:
         test_color_detector()
         test_cube_state()
+        test_apply_move()
         test_cube_solver()
+        test_solve_many()
+        test_solve_many_after_lut_build()
         test_move_explanations()
         
         print("🎉 ALL TESTS COMPLETED SUCCESSFULLY!")
         print("\nYour Rubik's Cube Solver is ready to use!")
         print("Run 'python main.py' to start the full application.")
         
-    except Exception as e:
+    except ImportError as e:
+        # A missing package or module file; any other error propagates with its traceback
         print(f"❌ Test failed with error: {str(e)}")
         print("\nPlease check your installation:")
         print("1. Make sure all required packages are installed")